@@ -1,20 +1,26 @@
 # src/app/gui/dialogs.py
 
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QPushButton, QFileDialog
-from PyQt6.QtCore import Qt
-from typing import List, Dict
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QTreeView, QPushButton, QFileDialog
+from PyQt6.QtCore import QCoreApplication, QSize, QThreadPool
+from typing import List, Dict, Optional, Tuple
 import os
+import codecs
 from app.models.rule import Rule
-from app.logic.organizer import Organizer
-from PyQt6.QtGui import QPixmap
+from app.threads.preview_thread import PreviewThread
+from app.threads.tasks import ThumbnailTask
+from app.gui.models import PreviewModel
+from PyQt6.QtGui import QImage, QPixmap, QPixmapCache
+
+THUMBNAIL_SIZE = QSize(400, 400)
+THUMBNAIL_CACHE_LIMIT_KB = 64 * 1024
 
 class FilePreviewDialog(QDialog):
-    def __init__(self, directory: str, rules: List[Rule], recursive: bool):
+    def __init__(self, directory: str, rules: List[Rule], recursive: bool, ext_index: Optional[Dict[str, str]] = None):
         super().__init__()
         self.directory = directory
         self.rules = rules
         self.recursive = recursive
-        self.organizer = Organizer(self.directory, self.rules, self.recursive, dry_run=True)
+        self.ext_index = ext_index
         self.initUI()
 
     def initUI(self):
@@ -22,36 +28,64 @@ class FilePreviewDialog(QDialog):
         self.setGeometry(100, 100, 600, 400)
         layout = QVBoxLayout()
 
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(['Current Location', 'New Location'])
+        self.model = PreviewModel()
+        self.tree = QTreeView()
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setModel(self.model)
         layout.addWidget(self.tree)
 
-        export_button = QPushButton('Export Preview')
-        export_button.clicked.connect(self.exportPreview)
-        layout.addWidget(export_button)
+        self.status_label = QLabel('Scanning...')
+        layout.addWidget(self.status_label)
+
+        # Enabled once the scan finishes so a partial preview is never exported
+        self.export_button = QPushButton('Export Preview')
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.exportPreview)
+        layout.addWidget(self.export_button)
 
         self.setLayout(layout)
         self.loadPreview()
 
     def loadPreview(self):
-        preview_data = self.organizer.get_preview()
-        self.populateTree(preview_data)
-
-    def populateTree(self, data: Dict[str, str]):
-        self.tree.clear()
-        for current_path, new_path in data.items():
-            item = QTreeWidgetItem(self.tree)
-            item.setText(0, current_path)
-            item.setText(1, new_path)
+        self._thread = PreviewThread(self.directory, self.rules, self.recursive, self.ext_index)
+        self._thread.batch_ready.connect(self.populateTree)
+        self._thread.finished.connect(self._thread.deleteLater)
+        self._thread.finished.connect(self._on_thread_finished)
+        self._thread.start()
+
+    def _on_thread_finished(self):
+        self._thread = None
+        self.status_label.setText(f"{self.model.rowCount()} files scanned")
+        self.export_button.setEnabled(True)
+
+    def populateTree(self, rows: List[Tuple[str, str]]):
+        self.tree.setUpdatesEnabled(False)
+        try:
+            self.model.append_rows(rows)
+        finally:
+            self.tree.setUpdatesEnabled(True)
+        self.status_label.setText(f"Scanning... {self.model.rowCount()} files")
+
+    def done(self, result: int):
+        if self._thread is not None:
+            self._thread.batch_ready.disconnect(self.populateTree)
+            self._thread.finished.disconnect(self._on_thread_finished)
+            # Don't block the GUI waiting for the walk to notice; hand the thread to the application
+            # so it outlives this dialog and is deleted by its finished -> deleteLater connection
+            self._thread.setParent(QCoreApplication.instance())
+            self._thread.requestInterruption()
+            self._thread = None
+        super().done(result)
 
     def exportPreview(self):
+        if self._thread is not None:
+            return
         file_name, _ = QFileDialog.getSaveFileName(self, "Export Preview", "", "Text Files (*.txt)")
         if file_name:
             try:
-                with open(file_name, 'w') as f:
-                    for i in range(self.tree.topLevelItemCount()):
-                        item = self.tree.topLevelItem(i)
-                        f.write(f"Current: {item.text(0)}\nNew: {item.text(1)}\n\n")
+                with open(file_name, 'w', buffering=1 << 20) as f:
+                    f.writelines(f"Current: {current}\nNew: {new}\n\n" for current, new in self.model.rows())
                 QLabel(self).setText("Preview exported successfully!")
             except Exception as e:
                 QLabel(self).setText(f"Error exporting preview: {str(e)}")
@@ -61,6 +95,7 @@ class SingleFilePreviewDialog(QDialog):
     def __init__(self, file_path: str):
         super().__init__()
         self.file_path = file_path
+        QPixmapCache.setCacheLimit(THUMBNAIL_CACHE_LIMIT_KB)
         self.initUI()
 
     def initUI(self):
@@ -75,13 +110,37 @@ class SingleFilePreviewDialog(QDialog):
 
     def loadPreview(self):
         if self.file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.gif')):
-            pixmap = QPixmap(self.file_path)
-            self.preview_label.setPixmap(pixmap.scaled(400, 400, Qt.AspectRatioMode.KeepAspectRatio))
+            try:
+                st = os.stat(self.file_path)
+            except OSError as e:
+                self.preview_label.setText(f"Cannot preview this file.\nError: {str(e)}")
+                return
+            self._thumbnail_key = f"{self.file_path}:{st.st_mtime_ns}:{st.st_size}"
+            pixmap = QPixmapCache.find(self._thumbnail_key)
+            if pixmap is not None:
+                self.preview_label.setPixmap(pixmap)
+                return
+            self.preview_label.setText("Loading...")
+            task = ThumbnailTask(self.file_path, THUMBNAIL_SIZE)
+            task.signals.loaded.connect(self._on_thumbnail_loaded)
+            QThreadPool.globalInstance().start(task)
         else:
             try:
-                with open(self.file_path, 'r', encoding='utf-8') as f:
-                    content = f.read(1000)  # Read first 1000 characters
+                fd = os.open(self.file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+                try:
+                    raw = os.read(fd, 1000)  # Read first 1000 bytes
+                finally:
+                    os.close(fd)
+                # Not final, so a multi-byte character cut at the boundary is dropped
+                content = codecs.getincrementaldecoder('utf-8')(errors='replace').decode(raw)
                 self.preview_label.setText(content)
             except Exception as e:
                 self.preview_label.setText(f"Cannot preview this file type.\nError: {str(e)}")
 
+    def _on_thumbnail_loaded(self, image: QImage):
+        if image.isNull():
+            self.preview_label.setText("Cannot preview this image.")
+        else:
+            pixmap = QPixmap.fromImage(image)
+            QPixmapCache.insert(self._thumbnail_key, pixmap)
+            self.preview_label.setPixmap(pixmap)
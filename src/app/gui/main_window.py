@@ -1,28 +1,66 @@
 # src/app/gui/main_window.py
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QTabWidget, QCheckBox,
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QTabWidget, QCheckBox,
     QPushButton, QTextEdit, QProgressBar, QComboBox, QLabel,
-    QTableWidget, QTableWidgetItem, QDialog, QFileDialog, QListWidget,
+    QTableView, QDialog, QFileDialog, QListView,
     QLineEdit, QDialogButtonBox, QMessageBox
 )
-from PyQt6.QtCore import Qt, QTranslator, QCoreApplication
+from PyQt6.QtCore import Qt, QStringListModel, QThreadPool, QTimer, QTranslator, QCoreApplication, QT_TR_NOOP
 from PyQt6.QtGui import QColor, QPalette
-from typing import List, Dict
-from app.threads.organizer_thread import FileOrganizerThread
-from app.threads.schedule_thread import ScheduleThread
-from app.utils.settings import load_settings, save_settings
-from app.models.rule import Rule
-from app.gui.dialogs import FilePreviewDialog
-import json
-import schedule
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
+from app.utils.settings import DEFAULT_MAX_WORKERS, DEFAULT_UNDO_LIMIT, get_positive_int, load_settings, save_settings
+from app.utils.json_io import load_file
+from app.models.rule import Rule, build_extension_index
+from app.gui.models import StatsModel
+
+@lru_cache(maxsize=None)
+def _build_dark_palette() -> QPalette:
+    """Build the dark theme palette once; QPalette is copied on assignment."""
+    dark_palette = QPalette()
+    dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
+    dark_palette.setColor(QPalette.ColorRole.WindowText, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
+    dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
+    dark_palette.setColor(QPalette.ColorRole.ToolTipBase, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53))
+    dark_palette.setColor(QPalette.ColorRole.ButtonText, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
+    dark_palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
+    dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
+    dark_palette.setColor(QPalette.ColorRole.HighlightedText, Qt.GlobalColor.black)
+    return dark_palette
+
+@lru_cache(maxsize=None)
+def _light_palette() -> QPalette:
+    """Return the style's standard palette, fetched once."""
+    return QApplication.style().standardPalette()  # type: ignore[union-attr]
 
 class FileOrganizerGUI(QMainWindow):
+    # (widget attribute, setter, source text) applied by retranslateUi
+    _TR_TABLE = (
+        ('directory_button', 'setText', QT_TR_NOOP('Select Directory')),
+        ('recursive_checkbox', 'setText', QT_TR_NOOP('Recursive')),
+        ('dry_run_checkbox', 'setText', QT_TR_NOOP('Dry Run')),
+        ('organize_button', 'setText', QT_TR_NOOP('Organize Files')),
+        ('undo_button', 'setText', QT_TR_NOOP('Undo Last Organization')),
+        ('preview_button', 'setText', QT_TR_NOOP('Preview Organization')),
+        ('dark_mode_checkbox', 'setText', QT_TR_NOOP('Dark Mode')),
+    )
+
     def __init__(self):
         super().__init__()
         self.rules: List[Rule] = self.load_initial_rules()
+        self._ext_index: Dict[str, str] = build_extension_index(self.rules)
         self.selected_directory: str = ""
+        self.undo_limit: Optional[int] = DEFAULT_UNDO_LIMIT
+        self.max_workers: int = DEFAULT_MAX_WORKERS
         self.translator: QTranslator = QTranslator()
+        self._translators: Dict[str, QTranslator] = {}
         self.initUI()
         self.loadSettings()
         self.retranslateUi()
@@ -36,6 +74,10 @@ class FileOrganizerGUI(QMainWindow):
             Rule(name='Audio', extensions=['.mp3', '.wav', '.flac', '.m4a']),
         ]
 
+    def _rebuild_ext_index(self) -> None:
+        """Rebuild the extension lookup table after the rules change."""
+        self._ext_index = build_extension_index(self.rules)
+
     def initUI(self) -> None:
         """Initialize the user interface."""
         self.setWindowTitle('File Organizer')
@@ -108,7 +150,10 @@ class FileOrganizerGUI(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout()
 
-        self.rules_list = QListWidget()
+        self._rules_model = QStringListModel()
+        self.rules_list = QListView()
+        self.rules_list.setModel(self._rules_model)
+        self.rules_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
         self.updateRulesList()
         layout.addWidget(self.rules_list)
 
@@ -137,9 +182,15 @@ class FileOrganizerGUI(QMainWindow):
         layout = QVBoxLayout()
 
         self.schedule_input = QLineEdit()
-        self.schedule_input.setPlaceholderText("Enter schedule (e.g., 'daily at 09:00')")
+        self.schedule_input.setPlaceholderText("HH:MM (e.g. 09:00)")
         layout.addWidget(self.schedule_input)
 
+        self.schedule_timer = QTimer(self)
+        self.schedule_timer.setSingleShot(True)
+        # Coarse timers on long intervals may fire up to half a second early
+        self.schedule_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.schedule_timer.timeout.connect(self._fire_scheduled)
+
         schedule_button = QPushButton('Set Schedule')
         schedule_button.clicked.connect(self.setSchedule)
         layout.addWidget(schedule_button)
@@ -155,9 +206,10 @@ class FileOrganizerGUI(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout()
 
-        self.stats_table = QTableWidget()
-        self.stats_table.setColumnCount(2)
-        self.stats_table.setHorizontalHeaderLabels(['Category', 'Files Organized'])
+        self.stats_model = StatsModel()
+        self.stats_table = QTableView()
+        self.stats_table.setModel(self.stats_model)
+        self.stats_table.verticalHeader().setDefaultSectionSize(20)  # type: ignore[union-attr]
         layout.addWidget(self.stats_table)
 
         tab.setLayout(layout)
@@ -175,6 +227,8 @@ class FileOrganizerGUI(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please select a directory first.")
             return
 
+        from app.threads.organizer_thread import FileOrganizerThread
+
         self.progress_bar.setValue(0)
         self.log_text.clear()
 
@@ -183,7 +237,10 @@ class FileOrganizerGUI(QMainWindow):
                 self.selected_directory,
                 self.recursive_checkbox.isChecked(),
                 self.dry_run_checkbox.isChecked(),
-                self.rules
+                self.rules,
+                self._ext_index,
+                self.undo_limit,
+                self.max_workers
             )
             self.organize_thread.update_progress.connect(self.update_progress)
             self.organize_thread.update_log.connect(self.update_log)
@@ -197,8 +254,14 @@ class FileOrganizerGUI(QMainWindow):
         """Undo the last organization action."""
         if hasattr(self, 'organize_thread'):
             try:
+                dropped = self.organize_thread.organizer.undo_dropped
+                kept = len(self.organize_thread.organizer.undo_actions)
                 self.organize_thread.undo()
-                self.log_text.append("Undo operation completed.")
+                if dropped:
+                    self.log_text.append(f"Undo operation completed for the most recent {kept} moves. "
+                                         f"{dropped} earlier moves exceeded the undo history and were not undone.")
+                else:
+                    self.log_text.append("Undo operation completed.")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"An error occurred during undo: {str(e)}")
         else:
@@ -210,8 +273,10 @@ class FileOrganizerGUI(QMainWindow):
             QMessageBox.warning(self, "Warning", "Please select a directory first.")
             return
 
+        from app.gui.dialogs import FilePreviewDialog
+
         try:
-            preview_dialog = FilePreviewDialog(self.selected_directory, self.rules, self.recursive_checkbox.isChecked())
+            preview_dialog = FilePreviewDialog(self.selected_directory, self.rules, self.recursive_checkbox.isChecked(), self._ext_index)
             preview_dialog.exec()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"An error occurred during preview: {str(e)}")
@@ -226,10 +291,7 @@ class FileOrganizerGUI(QMainWindow):
 
     def update_stats(self, stats: Dict[str, int]) -> None:
         """Update the statistics table."""
-        self.stats_table.setRowCount(len(stats))
-        for row, (category, count) in enumerate(stats.items()):
-            self.stats_table.setItem(row, 0, QTableWidgetItem(category))
-            self.stats_table.setItem(row, 1, QTableWidgetItem(str(count)))
+        self.stats_model.set_rows(list(stats.items()))
 
     def organization_finished(self) -> None:
         """Handle the completion of the organization process."""
@@ -260,43 +322,48 @@ class FileOrganizerGUI(QMainWindow):
             name = name_input.text()
             extensions = [ext.strip() for ext in extensions_input.text().split(',')]
             self.rules.append(Rule(name=name, extensions=extensions))
+            self._rebuild_ext_index()
             self.updateRulesList()
 
     def removeRule(self) -> None:
         """Remove the selected rule from the list."""
-        current_item = self.rules_list.currentItem()
-        if current_item:
-            rule_name = current_item.text().split(':')[0]
-            self.rules = [rule for rule in self.rules if rule.name != rule_name]
+        row = self.rules_list.currentIndex().row()
+        if 0 <= row < len(self.rules):
+            del self.rules[row]
+            self._rebuild_ext_index()
             self.updateRulesList()
         else:
             QMessageBox.warning(self, "Warning", "Please select a rule to remove.")
 
     def updateRulesList(self) -> None:
         """Update the displayed list of rules."""
-        self.rules_list.clear()
-        for rule in self.rules:
-            self.rules_list.addItem(f"{rule.name}: {', '.join(rule.extensions)}")
+        self._rules_model.setStringList([f"{rule.name}: {', '.join(sorted(rule.extensions))}" for rule in self.rules])
 
     def exportRules(self) -> None:
         """Export the current rules to a JSON file."""
         file_name, _ = QFileDialog.getSaveFileName(self, "Export Rules", "", "JSON Files (*.json)")
         if file_name:
-            try:
-                with open(file_name, 'w') as f:
-                    json.dump([rule.__dict__ for rule in self.rules], f)
-                QMessageBox.information(self, "Success", "Rules exported successfully.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"An error occurred while exporting rules: {str(e)}")
+            from app.threads.tasks import JsonExportTask
+
+            task = JsonExportTask([rule.to_dict() for rule in self.rules], file_name)
+            task.signals.finished.connect(self._on_rules_exported)
+            QThreadPool.globalInstance().start(task)  # type: ignore[union-attr]
+
+    def _on_rules_exported(self, success: bool, error: str) -> None:
+        """Report the outcome of a background rules export."""
+        if success:
+            QMessageBox.information(self, "Success", "Rules exported successfully.")
+        else:
+            QMessageBox.critical(self, "Error", f"An error occurred while exporting rules: {error}")
 
     def importRules(self) -> None:
         """Import rules from a JSON file."""
         file_name, _ = QFileDialog.getOpenFileName(self, "Import Rules", "", "JSON Files (*.json)")
         if file_name:
             try:
-                with open(file_name, 'r') as f:
-                    imported_rules = json.load(f)
+                imported_rules = load_file(file_name)
                 self.rules = [Rule(**rule) for rule in imported_rules]
+                self._rebuild_ext_index()
                 self.updateRulesList()
                 QMessageBox.information(self, "Success", "Rules imported successfully.")
             except Exception as e:
@@ -304,20 +371,39 @@ class FileOrganizerGUI(QMainWindow):
 
     def setSchedule(self) -> None:
         """Set a schedule for automatic organization."""
-        schedule_str = self.schedule_input.text()
+        schedule_str = self.schedule_input.text().strip()
         try:
-            schedule.clear()
-            schedule.every().day.at(schedule_str).do(self.scheduled_organization)
-            self.schedule_status.setText(f"Schedule set: {schedule_str}")
-
-            # Start the scheduling in a separate thread
-            self.schedule_thread = ScheduleThread()
-            self.schedule_thread.start()
-        except Exception as e:
+            schedule_time = datetime.strptime(schedule_str, '%H:%M').time()
+        except ValueError as e:
             QMessageBox.critical(self, "Error", f"Invalid schedule: {str(e)}")
+            return
+        now = datetime.now()
+        self._next_scheduled_run = datetime.combine(now.date(), schedule_time)
+        if self._next_scheduled_run <= now:
+            self._next_scheduled_run += timedelta(days=1)
+        self._arm_schedule_timer()
+        self.schedule_status.setText(f"Schedule set: {schedule_str}")
+
+    def _arm_schedule_timer(self) -> None:
+        """Start the schedule timer for the next scheduled run."""
+        msecs = (self._next_scheduled_run - datetime.now()).total_seconds() * 1000
+        self.schedule_timer.start(max(0, int(msecs)))
+
+    def _fire_scheduled(self) -> None:
+        """Run the scheduled organization and re-arm the timer for the next day."""
+        # Advance from the target rather than from now, so an early fire can't re-arm for the same run
+        now = datetime.now()
+        self._next_scheduled_run += timedelta(days=1)
+        while self._next_scheduled_run <= now:  # Missed days, e.g. after the machine slept
+            self._next_scheduled_run += timedelta(days=1)
+        self._arm_schedule_timer()
+        self.scheduled_organization()
 
     def scheduled_organization(self) -> None:
-        """Run the organization process on schedule."""
+        """Run the organization process on schedule, unless a run is still in progress."""
+        if getattr(self, 'organize_thread', None) is not None and self.organize_thread.isRunning():
+            self.log_text.append("Scheduled organization skipped: an organization is already running.")
+            return
         if self.selected_directory:
             self.start_organizing()
 
@@ -330,58 +416,51 @@ class FileOrganizerGUI(QMainWindow):
 
     def setDarkTheme(self) -> None:
         """Apply dark theme to the application."""
-        dark_palette = QPalette()
-        dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-        dark_palette.setColor(QPalette.ColorRole.WindowText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Base, QColor(25, 25, 25))
-        dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
-        dark_palette.setColor(QPalette.ColorRole.ToolTipBase, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53))
-        dark_palette.setColor(QPalette.ColorRole.ButtonText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
-        dark_palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
-        dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-        dark_palette.setColor(QPalette.ColorRole.HighlightedText, Qt.GlobalColor.black)
-        self.setPalette(dark_palette)
+        self.setPalette(_build_dark_palette())
 
     def setLightTheme(self) -> None:
         """Apply light theme to the application."""
-        self.setPalette(self.style().standardPalette())
+        self.setPalette(_light_palette())
 
     def changeLanguage(self, index: int) -> None:
         """Change the application language."""
         languages = ['en', 'es', 'fr', 'ja']
         locale = languages[index]
-        if self.translator.load(f"../translations/translations_{locale}.qm"):
-            QCoreApplication.instance().installTranslator(self.translator)
-            self.retranslateUi()
-        else:
-            QMessageBox.warning(self, "Warning", "Translation not available.")
+        translator = self._translators.get(locale)
+        if translator is None:
+            translator = QTranslator()
+            if not translator.load(f"../translations/translations_{locale}.qm"):
+                QMessageBox.warning(self, "Warning", "Translation not available.")
+                return
+            self._translators[locale] = translator
+        app = QCoreApplication.instance()
+        assert app is not None
+        app.removeTranslator(self.translator)
+        app.installTranslator(translator)
+        self.translator = translator
+        self.retranslateUi()
 
     def retranslateUi(self) -> None:
         """Update all text elements with translations."""
         self.setWindowTitle(self.tr('File Organizer'))
-        self.directory_button.setText(self.tr('Select Directory'))
-        self.recursive_checkbox.setText(self.tr('Recursive'))
-        self.dry_run_checkbox.setText(self.tr('Dry Run'))
-        self.organize_button.setText(self.tr('Organize Files'))
-        self.undo_button.setText(self.tr('Undo Last Organization'))
-        self.preview_button.setText(self.tr('Preview Organization'))
-        self.dark_mode_checkbox.setText(self.tr('Dark Mode'))
-        # ... add more translations as needed
+        for name, method, key in self._TR_TABLE:
+            getattr(getattr(self, name), method)(self.tr(key))
 
     def loadSettings(self) -> None:
         """Load application settings."""
         settings = load_settings()
         self.rules = [Rule(**rule) for rule in settings.get('rules', [])]
+        self.undo_limit = get_positive_int(settings, 'undo_limit', DEFAULT_UNDO_LIMIT, allow_none=True)
+        self.max_workers = get_positive_int(settings, 'max_workers', DEFAULT_MAX_WORKERS) or DEFAULT_MAX_WORKERS
+        self._rebuild_ext_index()
         self.updateRulesList()
 
     def saveSettings(self) -> None:
         """Save application settings."""
         settings = {
-            'rules': [rule.__dict__ for rule in self.rules]
+            'rules': [rule.to_dict() for rule in self.rules],
+            'undo_limit': self.undo_limit,
+            'max_workers': self.max_workers
         }
         save_settings(settings)
 
@@ -0,0 +1,104 @@
+# src/app/gui/models.py
+
+from PyQt6.QtCore import QAbstractItemModel, QAbstractTableModel, QModelIndex, Qt
+from typing import Any, Iterator, List, Optional, Tuple
+
+class PreviewModel(QAbstractItemModel):
+    HEADERS = ('Current Location', 'New Location')
+
+    def __init__(self, currents: Optional[List[str]] = None, news: Optional[List[str]] = None):
+        """
+        Initialize the PreviewModel.
+
+        :param currents: Current file paths
+        :param news: New file paths, parallel to currents
+        """
+        super().__init__()
+        self._cur: List[str] = currents if currents is not None else []
+        self._new: List[str] = news if news is not None else []
+
+    def append_rows(self, rows: List[Tuple[str, str]]) -> None:
+        """
+        Append (current, new) path pairs to the end of the model.
+
+        :param rows: Rows to append
+        """
+        if not rows:
+            return
+        first = len(self._cur)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        for current, new in rows:
+            self._cur.append(current)
+            self._new.append(new)
+        self.endInsertRows()
+
+    def rows(self) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over (current, new) path pairs.
+        """
+        return zip(self._cur, self._new)
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if parent.isValid() or not (0 <= row < len(self._cur)) or not (0 <= column < 2):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:  # type: ignore[override]
+        return QModelIndex()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._cur)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if index.column() == 0:
+            return self._cur[index.row()]
+        return self._new[index.row()]
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+
+class StatsModel(QAbstractTableModel):
+    HEADERS = ('Category', 'Files Organized')
+
+    def __init__(self):
+        super().__init__()
+        self._rows: List[Tuple[str, int]] = []
+
+    def set_rows(self, rows: List[Tuple[str, int]]) -> None:
+        """
+        Replace all rows with a single model reset.
+
+        :param rows: (category, count) pairs
+        """
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 2
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        category, count = self._rows[index.row()]
+        return category if index.column() == 0 else str(count)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
@@ -1,13 +1,89 @@
 # src/app/logic/organizer.py
 
+import errno
+import os
 import shutil
 import logging
-from typing import List, Callable, Dict, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Deque, List, Callable, Dict, Iterator, Optional, Set, Tuple
 from pathlib import Path
-from app.models.rule import Rule
+from app.models.rule import Rule, build_extension_index
+from app.utils.settings import DEFAULT_UNDO_LIMIT
+
+# errnos for filesystems that can't hard link, e.g. FAT and some network shares
+_NO_LINK_ERRNOS = {errno.EPERM, errno.ENOSYS, errno.ENOTSUP, errno.EOPNOTSUPP}
+
+def _move(src: str, dst: str) -> None:
+    """
+    Move a file without overwriting, falling back to copy and unlink across filesystems.
+
+    :param src: Source path
+    :param dst: Destination path
+    :raises FileExistsError: If dst already exists
+    """
+    if os.path.lexists(dst):
+        raise FileExistsError(errno.EEXIST, 'Destination already exists', dst)
+    try:
+        if os.name == 'nt':
+            os.rename(src, dst)  # Unlike os.replace, refuses to overwrite on Windows
+        else:
+            _link_and_unlink(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _copy_and_unlink(src, dst)
+
+def _link_and_unlink(src: str, dst: str) -> None:
+    """
+    Rename on POSIX without overwriting: a hard link fails if dst exists, where rename would replace it.
+
+    :param src: Source path
+    :param dst: Destination path
+    """
+    try:
+        os.link(src, dst, follow_symlinks=False)
+    except (OSError, NotImplementedError) as e:
+        if isinstance(e, OSError) and e.errno not in _NO_LINK_ERRNOS:
+            raise
+        # No hard links here; _move already checked that dst is free
+        os.replace(src, dst)
+        return
+    os.unlink(src)
+
+def _copy_and_unlink(src: str, dst: str) -> None:
+    """
+    Copy a file to another filesystem, then remove the original. Symlinks are recreated rather than followed.
+
+    shutil.copyfile uses the kernel's zero-copy paths (sendfile, copy_file_range, fcopyfile) where available.
+    Reflinks are not attempted since they cannot span filesystems.
+
+    :param src: Source path
+    :param dst: Destination path
+    """
+    if os.path.islink(src):
+        os.symlink(os.readlink(src), dst)
+        os.unlink(src)
+        return
+
+    dst_existed = os.path.lexists(dst)
+    try:
+        shutil.copyfile(src, dst)
+        shutil.copystat(src, dst)
+    except BaseException:
+        # Don't leave a partial copy behind, but never remove a file this move didn't create
+        if not dst_existed:
+            try:
+                os.unlink(dst)
+            except OSError:
+                pass
+        raise
+    os.unlink(src)
 
 class Organizer:
-    def __init__(self, directory: str, rules: List[Rule], recursive: bool = False, dry_run: bool = False):
+    LOG_BATCH_SIZE = 128
+
+    def __init__(self, directory: str, rules: List[Rule], recursive: bool = False, dry_run: bool = False, ext_index: Optional[Dict[str, str]] = None, max_workers: int = 1, undo_limit: Optional[int] = DEFAULT_UNDO_LIMIT):
         """
         Initialize the Organizer.
 
@@ -15,12 +91,31 @@ class Organizer:
         :param rules: List of organization rules
         :param recursive: Whether to organize subdirectories
         :param dry_run: If True, don't actually move files
+        :param ext_index: Precomputed extension to rule name mapping, built from rules if omitted
+        :param max_workers: Number of threads used to move files concurrently
+        :param undo_limit: Maximum number of moves remembered for undo, or None for no limit
         """
         self.directory = Path(directory)
+        self._dir_str = str(self.directory)
+        # Length of the directory plus its trailing separator, for slicing relative paths
+        self._dir_prefix_len = len(os.path.join(self._dir_str, ''))
         self.rules = rules
         self.recursive = recursive
         self.dry_run = dry_run
-        self.undo_actions: List[Tuple[Path, Path]] = []
+        self.max_workers = max_workers
+        self.ext_index = ext_index if ext_index is not None else build_extension_index(rules)
+        # Destination prefixes are plain strings so classifying a file builds no Path objects
+        self._rule_prefix: Dict[str, str] = {rule.name: os.path.join(self._dir_str, rule.name, '') for rule in rules}
+        # Multi-dot extensions such as '.tar.gz' can't be found by a last-dot lookup; they are matched first with str.endswith
+        self._multi_suffixes: List[Tuple[str, Tuple[str, ...]]] = []
+        for rule in rules:
+            suffixes = tuple(ext for ext in rule.extensions if ext.count('.') > 1)
+            if suffixes:
+                self._multi_suffixes.append((rule.name, suffixes))
+        self.undo_actions: Deque[Tuple[str, str]] = deque(maxlen=undo_limit)
+        # Moves pushed out of the bounded undo history; they can no longer be undone
+        self.undo_dropped = 0
+        self._dest_name_cache: Dict[str, Set[str]] = {}
         self.logger = logging.getLogger(__name__)
 
     def validate(self) -> bool:
@@ -30,28 +125,119 @@ class Organizer:
         :return: True if valid, False otherwise
         """
         if not self.directory.is_dir():
-            self.logger.error(f"Invalid directory: {self.directory}")
+            self.logger.error("Invalid directory: %s", self.directory)
             return False
         if not self.rules:
             self.logger.error("No rules provided")
             return False
         return True
 
-    def get_unique_filename(self, destination: Path, filename: str) -> str:
+    def get_unique_filename(self, destination: str, filename: str) -> str:
         """
-        Get a unique filename for the destination.
+        Get a unique filename for the destination and reserve it for the current run.
+
+        Each destination directory is listed once and its names are kept in memory, so
+        later collisions in the same directory cost no further syscalls. Names are compared
+        case-insensitively to stay safe on case-insensitive filesystems.
 
         :param destination: Destination directory
         :param filename: Original filename
         :return: Unique filename
         """
-        base, extension = filename.rsplit('.', 1)
+        names = self._dest_name_cache.get(destination)
+        if names is None:
+            try:
+                names = {name.casefold() for name in os.listdir(destination)}
+            except (FileNotFoundError, NotADirectoryError):
+                names = set()
+            self._dest_name_cache[destination] = names
+
+        base, dot, extension = filename.rpartition('.')
+        if not base:
+            base, dot, extension = filename, '', ''
         counter = 1
-        while (destination / filename).exists():
-            filename = f"{base}_{counter}.{extension}"
+        while filename.casefold() in names:
+            filename = f"{base}_{counter}{dot}{extension}"
             counter += 1
+        names.add(filename.casefold())
         return filename
 
+    def _iter_files(self, should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Walk the directory with os.scandir, descending into subdirectories only when recursive.
+
+        :param should_stop: Checked before each directory is listed; the walk ends once it returns True
+        :return: An iterator of (file path, file name) pairs
+        """
+        stack = [self._dir_str]
+        while stack:
+            if should_stop is not None and should_stop():
+                return
+            top = stack.pop()
+            try:
+                with os.scandir(top) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if self.recursive:
+                                stack.append(entry.path)
+                        elif entry.is_file():
+                            yield entry.path, entry.name
+            except OSError as e:
+                self.logger.error("Error scanning %s: %s", top, e)
+
+    def _relative(self, path: str) -> str:
+        """
+        Strip the organized directory from a path known to live under it.
+
+        :param path: Path under self.directory
+        :return: The path relative to self.directory
+        """
+        return path[self._dir_prefix_len:]
+
+    def _get_file_destination(self, relative_path: str, name: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Classify a file and work out where it should be moved.
+
+        :param relative_path: Path of the file relative to the organized directory
+        :param name: Name of the file
+        :return: The matching rule name and unique destination, or (None, None) if no rule matches
+        """
+        rule_name = None
+        if self._multi_suffixes:
+            lowered = name.lower()
+            for multi_rule, suffixes in self._multi_suffixes:
+                if lowered.endswith(suffixes):
+                    rule_name = multi_rule
+                    break
+        if rule_name is None:
+            dot = name.rfind('.')
+            # A leading dot marks a hidden file, not an extension
+            rule_name = self.ext_index.get(name[dot:].lower()) if dot > 0 else None
+        if rule_name is None:
+            return None, None
+        folder, _, filename = (self._rule_prefix[rule_name] + relative_path).rpartition(os.sep)
+        return rule_name, folder + os.sep + self.get_unique_filename(folder, filename)
+
+    def _scan_and_classify(self, on_error: Optional[Callable[[str, Exception], None]] = None, should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, str, Optional[str], Optional[str]]]:
+        """
+        Walk the directory once and classify every file, reserving unique destinations as it goes.
+
+        :param on_error: Called with the file path and exception when a file cannot be classified
+        :param should_stop: Checked before each directory is listed; the walk ends once it returns True
+        :return: An iterator of (file path, relative path, rule name, destination); rule name and destination are None for unrecognized files
+        """
+        self._dest_name_cache.clear()
+        for path, name in self._iter_files(should_stop):
+            relative_path = self._relative(path)
+            try:
+                rule_name, destination = self._get_file_destination(relative_path, name)
+            except Exception as e:
+                self.logger.error("Error processing %s: %s", path, e)
+                if on_error is not None:
+                    on_error(path, e)
+                continue
+            yield path, relative_path, rule_name, destination
+
     def organize_files(self, update_progress: Callable[[int], None], update_log: Callable[[str], None], update_stats: Callable[[Dict[str, int]], None]) -> None:
         """
         Organize files based on the given rules.
@@ -67,46 +253,94 @@ class Organizer:
         stats = {rule.name: 0 for rule in self.rules}
         stats['Unorganized'] = 0
 
-        total_files = sum(1 for _ in self.directory.rglob('*') if _.is_file())
+        # Log lines and progress ticks are batched: each callback may be a cross-thread Qt signal
+        log_buffer: List[str] = []
+
+        def flush_log() -> None:
+            if log_buffer:
+                update_log("\n".join(log_buffer))
+                log_buffer.clear()
+
+        def log(message: str) -> None:
+            log_buffer.append(message)
+            if len(log_buffer) >= self.LOG_BATCH_SIZE:
+                flush_log()
+
+        def report_error(file_path: str, e: Exception) -> None:
+            log(f"Error processing {file_path}: {str(e)}")
+
+        # Classify everything up front: gives the total for progress and keeps newly created rule folders out of the scan
+        classified = list(self._scan_and_classify(report_error))
+        total_files = len(classified)
         processed_files = 0
+        last_progress = -1
 
-        for file_path in self.directory.rglob('*'):
-            if file_path.is_file():
-                try:
-                    relative_path = file_path.relative_to(self.directory)
-                    
-                    if not self.recursive and file_path.parent != self.directory:
-                        continue
-
-                    file_ext = file_path.suffix.lower()
-                    for rule in self.rules:
-                        if file_ext in rule.extensions:
-                            destination_folder = self.directory / rule.name
-                            destination = destination_folder / relative_path
-                            destination.parent.mkdir(parents=True, exist_ok=True)
-                            
-                            unique_filename = self.get_unique_filename(destination.parent, destination.name)
-                            destination = destination.parent / unique_filename
-                            
-                            if not self.dry_run:
-                                shutil.move(str(file_path), str(destination))
-                                self.undo_actions.append((destination, file_path))
-                                update_log(f"Moved {relative_path} to {destination.relative_to(self.directory)}")
-                            else:
-                                update_log(f"Would move {relative_path} to {destination.relative_to(self.directory)}")
-                            stats[rule.name] += 1
-                            break
-                    else:
-                        update_log(f"Unrecognized file type: {relative_path}")
-                        stats['Unorganized'] += 1
-                except Exception as e:
-                    self.logger.error(f"Error processing {file_path}: {str(e)}")
-                    update_log(f"Error processing {file_path}: {str(e)}")
-
-                processed_files += 1
-                progress = int(processed_files / total_files * 100)
+        def advance() -> None:
+            nonlocal processed_files, last_progress
+            processed_files += 1
+            progress = processed_files * 100 // total_files
+            if progress != last_progress:
+                last_progress = progress
+                flush_log()
                 update_progress(progress)
 
+        moves: List[Tuple[str, str, str, str]] = []
+        for file_path, relative_path, rule_name, destination in classified:
+            if rule_name is None or destination is None:
+                log(f"Unrecognized file type: {relative_path}")
+                stats['Unorganized'] += 1
+                advance()
+            elif self.dry_run:
+                log(f"Would move {relative_path} to {self._relative(destination)}")
+                stats[rule_name] += 1
+                advance()
+            else:
+                moves.append((file_path, destination, relative_path, rule_name))
+
+        # One mkdir per distinct leaf folder; mkdir(parents=True) creates the shared ancestors along the way
+        folders = {os.path.dirname(destination) for _, destination, _, _ in moves}
+        folders.difference_update({str(ancestor) for folder in folders for ancestor in Path(folder).parents})
+        for folder in folders:
+            try:
+                os.makedirs(folder, exist_ok=True)
+            except OSError as e:
+                self.logger.error("Error creating %s: %s", folder, e)
+
+        def try_move(src: str, dst: str) -> Optional[Exception]:
+            try:
+                _move(src, dst)
+            except Exception as e:
+                return e
+            return None
+
+        def record(move: Tuple[str, str, str, str], error: Optional[Exception]) -> None:
+            file_path, destination, relative_path, rule_name = move
+            if error is not None:
+                self.logger.error("Error processing %s: %s", file_path, error)
+                log(f"Error processing {file_path}: {str(error)}")
+            else:
+                if len(self.undo_actions) == self.undo_actions.maxlen:
+                    self.undo_dropped += 1
+                self.undo_actions.append((destination, file_path))
+                log(f"Moved {relative_path} to {self._relative(destination)}")
+                stats[rule_name] += 1
+            advance()
+
+        if self.max_workers <= 1:
+            # A single worker gains nothing from a pool; skip the executor and per-file futures
+            for move in moves:
+                record(move, try_move(move[0], move[1]))
+        elif moves:
+            # Workers only move files; logging, stats and undo bookkeeping stay on this thread
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(try_move, move[0], move[1]): move for move in moves}
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+
+        flush_log()
+        if self.undo_dropped:
+            update_log(f"Undo history is limited to {self.undo_actions.maxlen} moves; "
+                       f"the {self.undo_dropped} earliest moves can't be undone.")
         if not self.dry_run:
             update_log("Organization complete!")
         else:
@@ -121,15 +355,22 @@ class Organizer:
         if not self.undo_actions:
             self.logger.info("No actions to undo")
             return
+        if self.undo_dropped:
+            self.logger.warning("Only the most recent %d moves can be undone; %d earlier moves were not recorded",
+                                len(self.undo_actions), self.undo_dropped)
 
         for new_path, original_path in reversed(self.undo_actions):
+            if os.path.lexists(original_path):
+                self.logger.error("Not undoing move of %s: %s exists again", new_path, original_path)
+                continue
             try:
-                shutil.move(str(new_path), str(original_path))
-                self.logger.info(f"Moved {new_path} back to {original_path}")
+                _move(new_path, original_path)
+                self.logger.info("Moved %s back to %s", new_path, original_path)
             except Exception as e:
-                self.logger.error(f"Error undoing move from {new_path} to {original_path}: {str(e)}")
+                self.logger.error("Error undoing move from %s to %s: %s", new_path, original_path, e)
 
         self.undo_actions.clear()
+        self.undo_dropped = 0
 
     def get_preview(self) -> Dict[str, str]:
         """
@@ -137,33 +378,18 @@ class Organizer:
 
         :return: A dictionary with current file paths as keys and new file paths as values
         """
-        preview = {}
+        return dict(self.iter_preview())
+
+    def iter_preview(self, should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily yield how each file would be organized.
+
+        :param should_stop: Checked before each directory is listed; the walk ends once it returns True
+        :return: An iterator of (current file path, new file path or "Unorganized") pairs
+        """
         if not self.validate():
             self.logger.error("Validation failed. Please check your directory and rules.")
-            return preview
-
-        for file_path in self.directory.rglob('*'):
-            if file_path.is_file():
-                try:
-                    relative_path = file_path.relative_to(self.directory)
-                    
-                    if not self.recursive and file_path.parent != self.directory:
-                        continue
-
-                    file_ext = file_path.suffix.lower()
-                    for rule in self.rules:
-                        if file_ext in rule.extensions:
-                            destination_folder = self.directory / rule.name
-                            destination = destination_folder / relative_path
-                            
-                            unique_filename = self.get_unique_filename(destination.parent, destination.name)
-                            destination = destination.parent / unique_filename
-                            
-                            preview[str(file_path)] = str(destination)
-                            break
-                    else:
-                        preview[str(file_path)] = "Unorganized"
-                except Exception as e:
-                    self.logger.error(f"Error processing {file_path}: {str(e)}")
-
-        return preview
+            return
+
+        for file_path, _, _, destination in self._scan_and_classify(should_stop=should_stop):
+            yield file_path, destination if destination is not None else "Unorganized"
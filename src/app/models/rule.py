@@ -1,9 +1,66 @@
 # src/app/models/rule.py
 
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
 
-@dataclass
+def normalize_extension(ext: str) -> Optional[str]:
+    """
+    Lowercase an extension and give it a leading dot, so '.JPG' and 'jpg' both become '.jpg'.
+
+    :param ext: Extension as entered by the user
+    :return: Normalized extension, or None if it is blank
+    """
+    ext = ext.strip().lower()
+    if not ext:
+        return None
+    if not ext.startswith('.'):
+        ext = '.' + ext
+    return ext
+
+@dataclass(frozen=True, init=False)
 class Rule:
+    # Declared by hand rather than with dataclass(slots=True) to stay compatible with Python 3.9
+    __slots__ = ('name', 'extensions')
+
     name: str
-    extensions: List[str]
+    extensions: FrozenSet[str]
+
+    def __init__(self, name: str, extensions: Iterable[str]):
+        """
+        Initialize the Rule.
+
+        :param name: Name of the rule and of the folder its files are moved to
+        :param extensions: Extensions claimed by the rule; normalized and deduplicated
+        """
+        normalized = (normalize_extension(ext) for ext in extensions)
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'extensions', frozenset(ext for ext in normalized if ext))
+
+    # Frozen slotted instances can't be restored through setattr, which copy and pickle use by default
+    def __getstate__(self) -> Dict[str, Any]:
+        return {'name': self.name, 'extensions': self.extensions}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the rule to a JSON-serializable dictionary.
+
+        :return: Dictionary with the rule's name and sorted extensions
+        """
+        return {'name': self.name, 'extensions': sorted(self.extensions)}
+
+def build_extension_index(rules: List[Rule]) -> Dict[str, str]:
+    """
+    Map each extension to the name of the first rule that claims it.
+
+    :param rules: List of organization rules
+    :return: Dictionary of extension to rule name
+    """
+    index: Dict[str, str] = {}
+    for rule in rules:
+        for ext in rule.extensions:
+            index.setdefault(ext, rule.name)
+    return index
@@ -2,15 +2,16 @@
 
 from PyQt6.QtCore import QThread, pyqtSignal
 from app.logic.organizer import Organizer
+from app.utils.settings import DEFAULT_MAX_WORKERS, DEFAULT_UNDO_LIMIT
 
 class FileOrganizerThread(QThread):
     update_progress = pyqtSignal(int)
     update_log = pyqtSignal(str)
     update_stats = pyqtSignal(dict)
 
-    def __init__(self, directory, recursive, dry_run, rules):
+    def __init__(self, directory, recursive, dry_run, rules, ext_index=None, undo_limit=DEFAULT_UNDO_LIMIT, max_workers=DEFAULT_MAX_WORKERS):
         super().__init__()
-        self.organizer = Organizer(directory, rules, recursive, dry_run)
+        self.organizer = Organizer(directory, rules, recursive, dry_run, ext_index, max_workers=max_workers, undo_limit=undo_limit)
 
     def run(self):
         self.organizer.organize_files(self.emit_progress, self.emit_log, self.emit_stats)
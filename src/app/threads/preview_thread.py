@@ -0,0 +1,26 @@
+# src/app/threads/preview_thread.py
+
+from PyQt6.QtCore import QThread, pyqtSignal
+from app.logic.organizer import Organizer
+
+class PreviewThread(QThread):
+    batch_ready = pyqtSignal(list)
+
+    BATCH_SIZE = 500
+
+    def __init__(self, directory, rules, recursive, ext_index=None):
+        super().__init__()
+        self.organizer = Organizer(directory, rules, recursive, dry_run=True, ext_index=ext_index)
+
+    def run(self):
+        batch = []
+        # The walk checks for interruption per directory, and every row is checked here
+        for row in self.organizer.iter_preview(self.isInterruptionRequested):
+            if self.isInterruptionRequested():
+                return
+            batch.append(row)
+            if len(batch) >= self.BATCH_SIZE:
+                self.batch_ready.emit(batch)
+                batch = []
+        if batch and not self.isInterruptionRequested():
+            self.batch_ready.emit(batch)
@@ -0,0 +1,64 @@
+# src/app/threads/tasks.py
+
+from PyQt6.QtCore import QObject, QRunnable, QSaveFile, QSize, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader
+from typing import Any
+from app.utils.json_io import dumps
+
+class ThumbnailSignals(QObject):
+    loaded = pyqtSignal(QImage)
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, file_path: str, size: QSize):
+        """
+        Initialize the ThumbnailTask.
+
+        :param file_path: Image file to decode
+        :param size: Bounding box the image is decoded into
+        """
+        super().__init__()
+        self.file_path = file_path
+        self.size = size
+        self.signals = ThumbnailSignals()
+
+    def run(self):
+        reader = QImageReader(self.file_path)
+        reader.setAutoTransform(True)
+        original_size = reader.size()
+        if original_size.isValid() and (original_size.width() > self.size.width() or original_size.height() > self.size.height()):
+            reader.setScaledSize(original_size.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatio))
+        self.signals.loaded.emit(reader.read())
+
+
+class ExportSignals(QObject):
+    finished = pyqtSignal(bool, str)
+
+class JsonExportTask(QRunnable):
+    def __init__(self, obj: Any, file_name: str):
+        """
+        Initialize the JsonExportTask.
+
+        :param obj: JSON-serializable object to write
+        :param file_name: Destination file, replaced atomically on success
+        """
+        super().__init__()
+        self.obj = obj
+        self.file_name = file_name
+        self.signals = ExportSignals()
+
+    def run(self):
+        try:
+            data = dumps(self.obj)
+        except Exception as e:
+            self.signals.finished.emit(False, str(e))
+            return
+        save_file = QSaveFile(self.file_name)
+        if not save_file.open(QSaveFile.OpenModeFlag.WriteOnly):
+            self.signals.finished.emit(False, save_file.errorString())
+            return
+        if save_file.write(data) != len(data) or not save_file.commit():
+            error = save_file.errorString()
+            save_file.cancelWriting()
+            self.signals.finished.emit(False, error)
+            return
+        self.signals.finished.emit(True, "")
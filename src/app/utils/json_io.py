@@ -0,0 +1,67 @@
+# src/app/utils/json_io.py
+
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None  # type: ignore[assignment]
+    import json
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to indented UTF-8 JSON.
+
+    :param obj: Object to serialize
+    :return: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+def loads(data: bytes) -> Any:
+    """
+    Deserialize a UTF-8 JSON document.
+
+    :param data: Encoded JSON document
+    :return: Decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def dump_file(obj: Any, file_name: str) -> None:
+    """
+    Serialize an object to a JSON file atomically.
+
+    The document is written to a temporary file next to the destination and moved into
+    place with os.replace, so an interrupted write never leaves a truncated file behind.
+
+    :param obj: Object to serialize
+    :param file_name: Destination file
+    """
+    data = dumps(obj)
+    tmp_name = file_name + '.tmp'
+    try:
+        with open(tmp_name, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        raise
+
+def load_file(file_name: str) -> Any:
+    """
+    Deserialize a JSON file.
+
+    :param file_name: Source file
+    :return: Decoded object
+    """
+    with open(file_name, 'rb') as f:
+        return loads(f.read())
@@ -1,17 +1,54 @@
 # src/app/utils/settings.py
 
-import json
+import copy
 import os
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
+from app.utils.json_io import dump_file, load_file
 
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), '../../../settings.json')
 
+# Maximum number of moves remembered for undo unless settings say otherwise
+DEFAULT_UNDO_LIMIT = 100_000
+
+# Number of threads moving files; more than one helps on network or HDD targets
+DEFAULT_MAX_WORKERS = 1
+
+# ((st_mtime_ns, st_size), parsed settings) of the last read
+_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
+def get_positive_int(settings: Dict[str, Any], key: str, default: Optional[int], allow_none: bool = False) -> Optional[int]:
+    """
+    Read a positive integer setting, falling back to the default when it is missing or invalid.
+
+    :param settings: Loaded settings
+    :param key: Setting name
+    :param default: Value used when the setting is missing or invalid
+    :param allow_none: Whether null is a valid value, meaning no limit
+    :return: The validated value
+    """
+    value = settings.get(key, default)
+    if value is None:
+        return None if allow_none else default
+    if isinstance(value, bool):
+        return default
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
 def load_settings() -> Dict[str, Any]:
-    if os.path.exists(SETTINGS_FILE):
-        with open(SETTINGS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    global _cache
+    try:
+        st = os.stat(SETTINGS_FILE)
+    except FileNotFoundError:
+        return {}
+    key = (st.st_mtime_ns, st.st_size)
+    if _cache is None or _cache[0] != key:
+        _cache = (key, load_file(SETTINGS_FILE))
+    return copy.deepcopy(_cache[1])
 
 def save_settings(settings: Dict[str, Any]) -> None:
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=4)
+    global _cache
+    dump_file(settings, SETTINGS_FILE)
+    _cache = None
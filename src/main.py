@@ -2,13 +2,57 @@
 
 import sys
 import os
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import QLocale, QTranslator
+from PyQt6.QtCore import QLocale, QStandardPaths, QTranslator
 from app.gui.main_window import FileOrganizerGUI
 from app.utils.translations import load_translations
 
+LOG_FILE_NAME = 'file_organizer.log'
+
+def default_log_file() -> str:
+    """
+    Get the log file path in the per-user application data directory, creating the directory if needed.
+
+    :return: Path of the log file
+    """
+    directory = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, LOG_FILE_NAME)
+
+def setup_logging(log_file: str, level: int = logging.WARNING) -> QueueListener:
+    """
+    Route log records through a queue to a listener thread that writes them to stderr and the log file.
+
+    Threads that log only enqueue the record, so disk writes never stall the organizer thread.
+
+    :param log_file: Path of the log file, opened on the first record
+    :param level: Root logger level
+    :return: The started listener; call stop() on exit to flush pending records
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    formatter = logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s')
+    file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+    file_handler.setFormatter(formatter)
+    # Keeps warnings and errors on stderr, as logging's last-resort handler did before
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(QueueHandler(log_queue))
+
+    listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
 def main():
     app = QApplication(sys.argv)
+    app.setApplicationName('File Organizer')
+    log_listener = setup_logging(default_log_file())
+    app.aboutToQuit.connect(log_listener.stop)
 
     # Load translations
     translator = QTranslator()
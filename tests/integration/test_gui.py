@@ -1,8 +1,17 @@
 # tests/integration/test_gui.py
 
+import os
+import tempfile
+import time
 import unittest
+import unittest.mock
+from datetime import timedelta
+from PyQt6.QtCore import Qt
 from PyQt6.QtWidgets import QApplication
 from app.gui.main_window import FileOrganizerGUI
+from app.gui.dialogs import FilePreviewDialog
+from app.models.rule import Rule
+from app.utils.settings import DEFAULT_UNDO_LIMIT
 
 class TestFileOrganizerGUI(unittest.TestCase):
     @classmethod
@@ -29,6 +38,70 @@ class TestFileOrganizerGUI(unittest.TestCase):
             self.assertEqual(self.window.selected_directory, 'test_dir')
             self.assertEqual(self.window.directory_button.text(), 'Selected: test_dir')
 
+    def test_translation_table_targets_exist(self):
+        for name, method, key in self.window._TR_TABLE:
+            with self.subTest(widget=name):
+                self.assertTrue(callable(getattr(getattr(self.window, name), method)))
+                self.assertEqual(getattr(self.window, name).text(), key)
+
+    def test_preview_export_waits_for_scan(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            open(os.path.join(tmp, 'photo.jpg'), 'w').close()
+            dialog = FilePreviewDialog(tmp, [Rule(name='Images', extensions=['.jpg'])], False)
+            self.assertFalse(dialog.export_button.isEnabled())
+
+            deadline = time.monotonic() + 5
+            while dialog._thread is not None and time.monotonic() < deadline:
+                self.app.processEvents()
+            self.assertTrue(dialog.export_button.isEnabled())
+            self.assertEqual(dialog.model.rowCount(), 1)
+            dialog.done(0)
+
+    def test_scheduled_run_rearms_for_next_day(self):
+        self.window.schedule_input.setText('09:00')
+        self.window.setSchedule()
+        first = self.window._next_scheduled_run
+        self.assertEqual((first.hour, first.minute), (9, 0))
+        self.assertEqual(self.window.schedule_timer.timerType(), Qt.TimerType.PreciseTimer)
+
+        with unittest.mock.patch.object(self.window, 'scheduled_organization') as mock_run:
+            # Firing slightly early still advances a whole day
+            with unittest.mock.patch('app.gui.main_window.datetime') as mock_datetime:
+                mock_datetime.now.return_value = first - timedelta(milliseconds=400)
+                self.window._fire_scheduled()
+        mock_run.assert_called_once_with()
+        self.assertEqual(self.window._next_scheduled_run, first + timedelta(days=1))
+        self.window.schedule_timer.stop()
+
+    def test_scheduled_run_skipped_while_organizing(self):
+        self.window.selected_directory = 'test_dir'
+        self.window.organize_thread = unittest.mock.Mock()
+        self.window.organize_thread.isRunning.return_value = True
+        with unittest.mock.patch.object(self.window, 'start_organizing') as mock_start:
+            self.window.scheduled_organization()
+        mock_start.assert_not_called()
+
+    def test_closing_preview_mid_scan_does_not_block(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(50):
+                os.makedirs(os.path.join(tmp, *(['d'] * (i + 1))), exist_ok=True)
+            dialog = FilePreviewDialog(tmp, [Rule(name='Images', extensions=['.jpg'])], True)
+            thread = dialog._thread
+            dialog.done(0)
+            self.assertIsNone(dialog._thread)
+            self.assertTrue(thread.isInterruptionRequested())
+            self.assertTrue(thread.wait(5000))
+
+    def test_settings_worker_count_reaches_organizer(self):
+        with unittest.mock.patch('app.gui.main_window.load_settings', return_value={'max_workers': 4, 'undo_limit': 'bad'}):
+            self.window.loadSettings()
+        self.assertEqual((self.window.max_workers, self.window.undo_limit), (4, DEFAULT_UNDO_LIMIT))
+
+        self.window.selected_directory = 'test_dir'
+        with unittest.mock.patch('app.threads.organizer_thread.FileOrganizerThread.start'):
+            self.window.start_organizing()
+        self.assertEqual(self.window.organize_thread.organizer.max_workers, 4)
+
     # Add more GUI integration tests as needed
 
     @classmethod
@@ -1,7 +1,6 @@
 # tests/mocks/mock_filesystem.py
 
 import os
-from unittest.mock import MagicMock
 
 def mock_os_walk(directory):
     # Define your mock directory structure here
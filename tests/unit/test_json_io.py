@@ -0,0 +1,44 @@
+# tests/unit/test_json_io.py
+
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.utils import json_io
+
+class TestJsonIO(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.file_name = os.path.join(tmp.name, 'rules.json')
+
+    def test_dump_file_replaces_atomically(self):
+        json_io.dump_file({'name': 'Images'}, self.file_name)
+        json_io.dump_file({'name': 'Documents'}, self.file_name)
+        self.assertEqual(json_io.load_file(self.file_name), {'name': 'Documents'})
+        self.assertFalse(os.path.exists(self.file_name + '.tmp'))
+
+    def test_failed_replace_keeps_original_and_removes_temp(self):
+        json_io.dump_file({'name': 'Images'}, self.file_name)
+        with patch('app.utils.json_io.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(OSError):
+                json_io.dump_file({'name': 'Documents'}, self.file_name)
+        self.assertEqual(json_io.load_file(self.file_name), {'name': 'Images'})
+        self.assertFalse(os.path.exists(self.file_name + '.tmp'))
+
+    def test_falls_back_to_stdlib_json_without_orjson(self):
+        self.addCleanup(importlib.reload, json_io)
+        with patch.dict(sys.modules, {'orjson': None}):
+            importlib.reload(json_io)
+        self.assertIsNone(json_io.orjson)
+
+        data = json_io.dumps({'name': 'Café', 'extensions': ['.jpg']})
+        self.assertEqual(data, '{\n  "name": "Café",\n  "extensions": [\n    ".jpg"\n  ]\n}'.encode('utf-8'))
+        self.assertEqual(json_io.loads(data), {'name': 'Café', 'extensions': ['.jpg']})
+        json_io.dump_file([1, 2], self.file_name)
+        self.assertEqual(json_io.load_file(self.file_name), [1, 2])
+
+if __name__ == '__main__':
+    unittest.main()
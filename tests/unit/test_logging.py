@@ -0,0 +1,40 @@
+# tests/unit/test_logging.py
+
+import io
+import logging
+import os
+import tempfile
+import unittest
+from logging.handlers import QueueHandler
+from unittest.mock import patch
+from main import setup_logging
+
+class TestSetupLogging(unittest.TestCase):
+    def setUp(self):
+        root = logging.getLogger()
+        self.addCleanup(root.setLevel, root.level)
+        self.addCleanup(setattr, root, 'handlers', list(root.handlers))
+
+    def test_records_reach_file_and_stderr(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = os.path.join(tmp, 'organizer.log')
+            with patch('sys.stderr', new_callable=io.StringIO) as stderr:
+                listener = setup_logging(log_file)
+                self.assertTrue(any(isinstance(h, QueueHandler) for h in logging.getLogger().handlers))
+                self.assertFalse(os.path.exists(log_file))  # Opened lazily on the first record
+
+                logging.getLogger('app.test').error("Error moving %s", 'a.jpg')
+                logging.getLogger('app.test').info("Moved %s back", 'a.jpg')
+                listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+
+            with open(log_file, encoding='utf-8') as f:
+                contents = f.read()
+            for output in (contents, stderr.getvalue()):
+                self.assertIn('ERROR app.test: Error moving a.jpg', output)
+                # INFO records are below the default level and never formatted
+                self.assertNotIn('Moved a.jpg back', output)
+
+if __name__ == '__main__':
+    unittest.main()
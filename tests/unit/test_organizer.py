@@ -1,45 +1,347 @@
 # tests/unit/test_organizer.py
 
+import ast
+import copy
+import errno
+import inspect
+import os
+import pickle
+import tempfile
 import unittest
+from pathlib import Path
+from app.logic import organizer as organizer_module
 from app.logic.organizer import Organizer
-from app.models.rule import Rule
-from unittest.mock import patch, MagicMock
+from app.models.rule import Rule, build_extension_index
+from unittest.mock import call, patch, Mock
+from tests.mocks.mock_filesystem import mock_os_walk
 
 class TestOrganizer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Rules are frozen, so one set is shared by every test
+        cls._rules = (
+            Rule(name='Images', extensions=frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp'})),
+            Rule(name='Documents', extensions=frozenset({'.pdf', '.doc', '.docx', '.txt', '.rtf'})),
+        )
+        cls._undo_organizer = Organizer(directory='test_dir', rules=cls._rules)
+        # Built once for the class; tests that read it run as dry runs and leave it untouched
+        cls._tree = tempfile.TemporaryDirectory()
+        for top, _, files in mock_os_walk(cls._tree.name):
+            os.makedirs(top, exist_ok=True)
+            for name in files:
+                open(os.path.join(top, name), 'w').close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tree.cleanup()
+
     def setUp(self):
-        self.rules = [
-            Rule(name='Images', extensions=['.jpg', '.jpeg', '.png', '.gif', '.bmp']),
-            Rule(name='Documents', extensions=['.pdf', '.doc', '.docx', '.txt', '.rtf']),
-        ]
+        self.rules = self._rules
         self.organizer = Organizer(directory='test_dir', rules=self.rules, recursive=True, dry_run=True)
 
-    @patch('app.logic.organizer.os')
-    @patch('app.logic.organizer.shutil')
-    def test_organize_files(self, mock_shutil, mock_os):
-        # Setup mock behavior
-        mock_os.walk.return_value = [
-            ('test_dir', ('subdir',), ('file1.jpg', 'file2.pdf', 'file3.unknown')),
-            ('test_dir/subdir', (), ('file4.png',)),
-        ]
-        self.organizer.organize_files(lambda x: None, lambda y: None, lambda z: None)
+    def test_organize_files(self):
+        stats = {}
+        organizer = Organizer(directory=self._tree.name, rules=self.rules, recursive=True, dry_run=True)
+        with patch('app.logic.organizer._move', new_callable=Mock) as mock_move:
+            organizer.organize_files(lambda x: None, lambda y: None, stats.update)
 
-        # Assertions
-        mock_shutil.move.assert_not_called()  # Because dry_run=True
-        # Add more assertions as needed
+        mock_move.assert_not_called()  # Because dry_run=True
+        self.assertEqual(stats, {'Images': 2, 'Documents': 1, 'Unorganized': 1})
 
     def test_get_unique_filename(self):
-        with patch('os.path.exists') as mock_exists:
-            mock_exists.side_effect = [True, True, False]
+        listed = []
+
+        def listdir(path):
+            listed.append(path)
+            return ['file.txt', 'FILE_1.txt']
+
+        with patch('app.logic.organizer.os.listdir', new=listdir):
             unique_name = self.organizer.get_unique_filename('destination', 'file.txt')
             self.assertEqual(unique_name, 'file_2.txt')
+            # The chosen name is reserved and the directory is not listed again
+            self.assertEqual(self.organizer.get_unique_filename('destination', 'file.txt'), 'file_3.txt')
+        self.assertEqual(listed, ['destination'])
+
+    def test_get_unique_filename_table(self):
+        cases = [
+            ([], 'file.jpg', 'file.jpg'),
+            (['file.jpg'], 'file.jpg', 'file_1.jpg'),
+            (['file.jpg', 'file_1.jpg', 'FILE_2.JPG'], 'file.jpg', 'file_3.jpg'),
+            (['archive.tar.gz'], 'archive.tar.gz', 'archive.tar_1.gz'),
+            (['README'], 'README', 'README_1'),
+            ([], 'LICENSE', 'LICENSE'),
+        ]
+        with patch('app.logic.organizer.os.listdir') as mock_listdir:
+            for existing, filename, expected in cases:
+                with self.subTest(filename=filename, existing=existing):
+                    self.organizer._dest_name_cache.clear()
+                    mock_listdir.reset_mock()
+                    mock_listdir.return_value = existing
+                    self.assertEqual(self.organizer.get_unique_filename('destination', filename), expected)
+                    self.assertEqual(mock_listdir.call_args_list, [call('destination')])
+
+    def test_build_extension_index(self):
+        rules = self.rules + (Rule(name='Pictures', extensions=('.JPG', 'WebP', ' ')),)
+        index = build_extension_index(rules)
+        self.assertEqual(index['.jpg'], 'Images')
+        self.assertEqual(index['.webp'], 'Pictures')
+        self.assertNotIn('.', index)
+        self.assertEqual(index['.txt'], 'Documents')
+        self.assertNotIn('.mp3', index)
+
+    def test_rule_normalizes_extensions(self):
+        rule = Rule(name='Pictures', extensions=['.JPG', 'png', ' ', '.jpg'])
+        self.assertEqual(rule.extensions, frozenset({'.jpg', '.png'}))
+        self.assertEqual(rule.to_dict(), {'name': 'Pictures', 'extensions': ['.jpg', '.png']})
+        self.assertEqual(hash(rule), hash(Rule(name='Pictures', extensions=['.png', '.jpg'])))
+
+    def test_multi_dot_extensions_take_precedence(self):
+        rules = [Rule(name='Archives', extensions=frozenset({'.tar.gz', '.zip'})), Rule(name='Compressed', extensions=frozenset({'.gz'}))]
+        # The rule folders don't exist under the shared tree, so destinations resolve without patching os
+        organizer = Organizer(directory=self._tree.name, rules=rules)
+        self.assertEqual(organizer._get_file_destination('backup.TAR.GZ', 'backup.TAR.GZ')[0], 'Archives')
+        self.assertEqual(organizer._get_file_destination('log.gz', 'log.gz')[0], 'Compressed')
+        self.assertEqual(organizer._get_file_destination('src.zip', 'src.zip')[0], 'Archives')
+
+    def test_rule_copies_and_pickles(self):
+        rule = Rule(name='Images', extensions=['.jpg', '.png'])
+        for clone in (copy.copy(rule), copy.deepcopy(rule), pickle.loads(pickle.dumps(rule))):
+            with self.subTest(clone=clone):
+                self.assertEqual(clone, rule)
+                self.assertEqual(clone.extensions, frozenset({'.jpg', '.png'}))
+
+    def test_iter_files_respects_recursive(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'sub'))
+            for name in ('top.jpg', os.path.join('sub', 'nested.pdf')):
+                open(os.path.join(tmp, name), 'w').close()
+
+            flat = Organizer(directory=tmp, rules=self.rules)
+            self.assertEqual([name for _, name in flat._iter_files()], ['top.jpg'])
+
+            deep = Organizer(directory=tmp, rules=self.rules, recursive=True)
+            self.assertEqual(sorted(name for _, name in deep._iter_files()), ['nested.pdf', 'top.jpg'])
+
+    def test_get_preview_uses_plain_strings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in ('a.jpg', 'A.JPG', 'notes.bin'):
+                open(os.path.join(tmp, name), 'w').close()
+            organizer = Organizer(directory=tmp, rules=self.rules)
+            with patch('app.logic.organizer.Path', new_callable=Mock, side_effect=AssertionError('Path built during preview')):
+                preview = organizer.get_preview()
+
+            images = os.path.join(tmp, 'Images')
+            self.assertEqual(preview[os.path.join(tmp, 'notes.bin')], 'Unorganized')
+            self.assertEqual(
+                {preview[os.path.join(tmp, 'a.jpg')], preview[os.path.join(tmp, 'A.JPG')]},
+                {os.path.join(images, 'a.jpg'), os.path.join(images, 'A_1.JPG')}
+            )
+
+    def test_iter_preview_stops_between_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'sub'))
+            for name in ('top.jpg', os.path.join('sub', 'nested.pdf')):
+                open(os.path.join(tmp, name), 'w').close()
+            checks = []
+
+            def should_stop():
+                checks.append(None)
+                return len(checks) > 1  # Let only the top directory be listed
+
+            organizer = Organizer(directory=tmp, rules=self.rules, recursive=True)
+            preview = dict(organizer.iter_preview(should_stop))
+
+            self.assertEqual(list(preview), [os.path.join(tmp, 'top.jpg')])
+            self.assertEqual(len(checks), 2)
+
+    def test_organize_files_parallel_moves_and_undo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            names = [f'photo{i}.jpg' for i in range(10)] + ['notes.txt', 'data.bin']
+            for name in names:
+                open(os.path.join(tmp, name), 'w').close()
+            stats = {}
+            organizer = Organizer(directory=tmp, rules=self.rules, max_workers=4)
+            organizer.organize_files(lambda x: None, lambda y: None, stats.update)
+
+            self.assertEqual(stats, {'Images': 10, 'Documents': 1, 'Unorganized': 1})
+            self.assertEqual(len(os.listdir(os.path.join(tmp, 'Images'))), 10)
+            self.assertEqual(os.listdir(os.path.join(tmp, 'Documents')), ['notes.txt'])
+
+            organizer.undo()
+            self.assertEqual(sorted(n for n in os.listdir(tmp) if os.path.isfile(os.path.join(tmp, n))), sorted(names))
+
+    def test_organize_files_recursive_creates_nested_folders(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'sub', 'deep'))
+            for name in ('top.jpg', os.path.join('sub', 'x.jpg'), os.path.join('sub', 'deep', 'y.jpg')):
+                open(os.path.join(tmp, name), 'w').close()
+            messages = []
+            created = []
+
+            def makedirs(name, exist_ok=False):
+                # os.makedirs recurses through the patched name, so record the call and create with Path instead
+                created.append(name)
+                Path(name).mkdir(parents=True, exist_ok=exist_ok)
+
+            organizer = Organizer(directory=tmp, rules=self.rules, recursive=True)
+            with patch('app.logic.organizer.os.makedirs', new=makedirs):
+                organizer.organize_files(lambda x: None, messages.append, lambda z: None)
+
+            images = os.path.join(tmp, 'Images')
+            # Images and Images/sub are ancestors of Images/sub/deep, so only the leaf is created
+            self.assertEqual(created, [os.path.join(images, 'sub', 'deep')])
+            for name in ('top.jpg', os.path.join('sub', 'x.jpg'), os.path.join('sub', 'deep', 'y.jpg')):
+                self.assertTrue(os.path.isfile(os.path.join(images, name)))
+                self.assertFalse(os.path.exists(os.path.join(tmp, name)))
+            lines = '\n'.join(messages).split('\n')
+            moved = os.path.join('sub', 'x.jpg')
+            self.assertIn(f"Moved {moved} to {os.path.join('Images', moved)}", lines)
+
+    def test_organize_files_single_worker_moves_serially(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            open(os.path.join(tmp, 'photo.jpg'), 'w').close()
+            stats = {}
+            organizer = Organizer(directory=tmp, rules=self.rules)
+            with patch('app.logic.organizer.ThreadPoolExecutor', new_callable=Mock, side_effect=AssertionError('pool created')):
+                organizer.organize_files(lambda x: None, lambda y: None, stats.update)
+
+            self.assertEqual(stats, {'Images': 1, 'Documents': 0, 'Unorganized': 0})
+            self.assertEqual(list(organizer.undo_actions), [(os.path.join(tmp, 'Images', 'photo.jpg'), os.path.join(tmp, 'photo.jpg'))])
+
+    def test_organize_files_batches_callbacks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(1000):
+                open(os.path.join(tmp, f'file{i}.txt'), 'w').close()
+            progress = []
+            messages = []
+            organizer = Organizer(directory=tmp, rules=self.rules, dry_run=True)
+            organizer.organize_files(progress.append, messages.append, lambda z: None)
+
+            self.assertEqual(progress, list(range(101)))
+            lines = [line for message in messages for line in message.split('\n')]
+            self.assertEqual(len(lines), 1001)
+            self.assertLess(len(messages), 150)
+
+    def test_single_organizer_definition(self):
+        tree = ast.parse(inspect.getsource(organizer_module))
+        definitions = [node for node in tree.body if isinstance(node, ast.ClassDef) and node.name == 'Organizer']
+        self.assertEqual(len(definitions), 1)
+        self.assertTrue(hasattr(Organizer, '_get_file_destination'))
+
+    def test_move_falls_back_across_filesystems(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'src.txt'), os.path.join(tmp, 'dst.txt')
+            with open(src, 'w') as f:
+                f.write('payload')
+            os.utime(src, (1_000_000, 1_000_000))
+            with patch(f"app.logic.organizer.os.{'rename' if os.name == 'nt' else 'link'}", side_effect=OSError(errno.EXDEV, 'Invalid cross-device link')):
+                organizer_module._move(src, dst)
+
+            self.assertFalse(os.path.exists(src))
+            with open(dst) as f:
+                self.assertEqual(f.read(), 'payload')
+            self.assertEqual(os.stat(dst).st_mtime, 1_000_000)
+
+    def test_move_never_overwrites(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'src.txt'), os.path.join(tmp, 'dst.txt')
+            for name, text in ((src, 'new'), (dst, 'keep')):
+                with open(name, 'w') as f:
+                    f.write(text)
+            with self.assertRaises(FileExistsError):
+                organizer_module._move(src, dst)
+
+            with open(dst) as f:
+                self.assertEqual(f.read(), 'keep')
+            self.assertTrue(os.path.exists(src))
+
+    def test_undo_skips_recreated_original(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            open(os.path.join(tmp, 'photo.jpg'), 'w').close()
+            organizer = Organizer(directory=tmp, rules=self.rules)
+            organizer.organize_files(lambda x: None, lambda y: None, lambda z: None)
+            with open(os.path.join(tmp, 'photo.jpg'), 'w') as f:
+                f.write('new')
+
+            with self.assertLogs('app.logic.organizer', 'ERROR'):
+                organizer.undo()
+            with open(os.path.join(tmp, 'photo.jpg')) as f:
+                self.assertEqual(f.read(), 'new')
+            self.assertTrue(os.path.exists(os.path.join(tmp, 'Images', 'photo.jpg')))
+
+    def test_cross_filesystem_move_removes_partial_copy(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'src.txt'), os.path.join(tmp, 'dst.txt')
+            open(src, 'w').close()
+            with patch('app.logic.organizer.shutil.copystat', side_effect=OSError('copystat failed')):
+                with self.assertRaises(OSError):
+                    organizer_module._copy_and_unlink(src, dst)
+
+            self.assertTrue(os.path.exists(src))
+            self.assertFalse(os.path.exists(dst))
+
+    def test_cross_filesystem_move_keeps_existing_destination(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src, dst = os.path.join(tmp, 'missing.txt'), os.path.join(tmp, 'dst.txt')
+            with open(dst, 'w') as f:
+                f.write('keep')
+            with self.assertRaises(FileNotFoundError):
+                organizer_module._copy_and_unlink(src, dst)
+
+            with open(dst) as f:
+                self.assertEqual(f.read(), 'keep')
+
+    @unittest.skipUnless(hasattr(os, 'symlink') and os.name != 'nt', 'requires symlinks')
+    def test_cross_filesystem_move_recreates_symlinks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, 'target.txt')
+            src, dst = os.path.join(tmp, 'link.txt'), os.path.join(tmp, 'moved.txt')
+            open(target, 'w').close()
+            os.symlink(target, src)
+            organizer_module._copy_and_unlink(src, dst)
+
+            self.assertFalse(os.path.lexists(src))
+            self.assertTrue(os.path.islink(dst))
+            self.assertEqual(os.readlink(dst), target)
+
+    def test_undo_history_is_bounded(self):
+        organizer = Organizer(directory='test_dir', rules=self.rules, undo_limit=2)
+        for i in range(5):
+            organizer.undo_actions.append((f'new{i}', f'old{i}'))
+        self.assertEqual(list(organizer.undo_actions), [('new3', 'old3'), ('new4', 'old4')])
+
+    def test_undo_history_overflow_is_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            for i in range(3):
+                open(os.path.join(tmp, f'photo{i}.jpg'), 'w').close()
+            messages = []
+            organizer = Organizer(directory=tmp, rules=self.rules, undo_limit=2)
+            organizer.organize_files(lambda x: None, messages.append, lambda z: None)
+
+            self.assertEqual(organizer.undo_dropped, 1)
+            self.assertIn("Undo history is limited to 2 moves; the 1 earliest moves can't be undone.", messages)
+            with self.assertLogs('app.logic.organizer', 'WARNING') as logs:
+                organizer.undo()
+            self.assertIn('Only the most recent 2 moves can be undone; 1 earlier moves were not recorded', logs.output[0])
+            self.assertEqual(organizer.undo_dropped, 0)
 
     def test_undo(self):
-        self.organizer.undo_actions = [("new_path1", "original_path1"), ("new_path2", "original_path2")]
-        with patch('app.logic.organizer.shutil.move') as mock_move:
-            self.organizer.undo()
-            mock_move.assert_any_call("new_path2", "original_path2")
-            mock_move.assert_any_call("new_path1", "original_path1")
-            self.assertEqual(len(self.organizer.undo_actions), 0)
+        organizer = self._undo_organizer
+        self.addCleanup(organizer.undo_actions.clear)
+        organizer.undo_actions.extend([("new_path1", "original_path1"), ("new_path2", "original_path2")])
+        with patch('app.logic.organizer._move', new_callable=Mock) as mock_move:
+            organizer.undo()
+            # Undone most recent first
+            self.assertEqual(
+                [c.args for c in mock_move.call_args_list],
+                [("new_path2", "original_path2"), ("new_path1", "original_path1")]
+            )
+            self.assertEqual(len(organizer.undo_actions), 0)
+
+    def test_undo_without_actions(self):
+        with patch('app.logic.organizer._move', new_callable=Mock) as mock_move:
+            self._undo_organizer.undo()
+        mock_move.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
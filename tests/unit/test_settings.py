@@ -0,0 +1,74 @@
+# tests/unit/test_settings.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.utils import json_io, settings
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.settings_file = os.path.join(tmp.name, 'settings.json')
+        for patcher in (patch.object(settings, 'SETTINGS_FILE', self.settings_file), patch.object(settings, '_cache', None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_missing_file_loads_empty(self):
+        self.assertEqual(settings.load_settings(), {})
+
+    def test_save_and_load_round_trip(self):
+        settings.save_settings({'rules': [{'name': 'Images', 'extensions': ['.jpg']}], 'undo_limit': 10})
+        self.assertIsNone(settings._cache)
+        self.assertEqual(settings.load_settings(), {'rules': [{'name': 'Images', 'extensions': ['.jpg']}], 'undo_limit': 10})
+
+    def test_unchanged_file_is_parsed_once(self):
+        settings.save_settings({'undo_limit': 10})
+        with patch('app.utils.settings.load_file', wraps=json_io.load_file) as mock_load:
+            settings.load_settings()
+            settings.load_settings()
+        self.assertEqual(mock_load.call_count, 1)
+
+    def test_cache_invalidated_by_mtime_or_size(self):
+        settings.save_settings({'undo_limit': 10})
+        self.assertEqual(settings.load_settings(), {'undo_limit': 10})
+
+        # Same size, different mtime
+        with open(self.settings_file, 'wb') as f:
+            f.write(json_io.dumps({'undo_limit': 20}))
+        st = os.stat(self.settings_file)
+        os.utime(self.settings_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(settings.load_settings(), {'undo_limit': 20})
+
+        # Different size, mtime restored to the cached one
+        with open(self.settings_file, 'wb') as f:
+            f.write(json_io.dumps({'undo_limit': 300}))
+        os.utime(self.settings_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(settings.load_settings(), {'undo_limit': 300})
+
+    def test_returned_settings_are_copies(self):
+        settings.save_settings({'rules': [{'name': 'Images', 'extensions': ['.jpg']}]})
+        loaded = settings.load_settings()
+        loaded['rules'][0]['extensions'].append('.png')
+        self.assertEqual(settings.load_settings(), {'rules': [{'name': 'Images', 'extensions': ['.jpg']}]})
+
+    def test_get_positive_int_validates(self):
+        cases = [
+            ({}, 100),
+            ({'undo_limit': 5}, 5),
+            ({'undo_limit': '7'}, 7),
+            ({'undo_limit': None}, None),
+            ({'undo_limit': -1}, 100),
+            ({'undo_limit': 0}, 100),
+            ({'undo_limit': 'lots'}, 100),
+            ({'undo_limit': True}, 100),
+            ({'undo_limit': [3]}, 100),
+        ]
+        for loaded, expected in cases:
+            with self.subTest(settings=loaded):
+                self.assertEqual(settings.get_positive_int(loaded, 'undo_limit', 100, allow_none=True), expected)
+        self.assertEqual(settings.get_positive_int({'max_workers': None}, 'max_workers', 1), 1)
+
+if __name__ == '__main__':
+    unittest.main()